@@ -13,7 +13,7 @@
 # the License.
 """Defines a class used to write code to an output buffer."""
 
-from typing import List
+from typing import Iterable, List
 
 
 class OutputFile:
@@ -50,9 +50,15 @@ class OutputFile:
 
     def write_line(self, line: str = '') -> None:
         if line:
-            self._content.append(' ' * self._indentation)
-            self._content.append(line)
-        self._content.append('\n')
+            self._content.append(f'{" " * self._indentation}{line}\n')
+        else:
+            self._content.append('\n')
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Writes each line at the current indentation level."""
+        indentation = ' ' * self._indentation
+        self._content.extend(f'{indentation}{line}\n' if line else '\n'
+                             for line in lines)
 
     def indent(
         self,
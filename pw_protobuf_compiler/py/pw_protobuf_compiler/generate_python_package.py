@@ -15,9 +15,11 @@
 
 import argparse
 from collections import defaultdict
+import json
+import os
 from pathlib import Path
 import sys
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 
 # Make sure dependencies are optional, since this script may be run when
 # installing Python package dependencies through GN.
@@ -30,13 +32,13 @@ _SETUP_TEMPLATE = """# Generated file. Do not modify.
 import setuptools
 
 setuptools.setup(
-    name={name!r},
+    name={name},
     version='0.0.1',
     author='Pigweed Authors',
     author_email='pigweed-developers@googlegroups.com',
     description='Generated protobuf files',
-    packages={packages!r},
-    package_data={package_data!r},
+    packages={packages},
+    package_data={package_data},
     include_package_data=True,
     zip_safe=False,
     install_requires=['protobuf'],
@@ -67,20 +69,26 @@ def main(package: str, setup: Path, sources: List[Path]) -> int:
     base.mkdir(exist_ok=True)
 
     # Find all directories in the package, including empty ones.
-    subpackages: Set[Path] = set()
+    prefixes: Set[Tuple[str, ...]] = set()
     for source in sources:
-        subpackages.update(base / path for path in source.parents)
-    subpackages.remove(base)
+        parts = source.parent.parts
+        prefixes.update(parts[:i] for i in range(1, len(parts) + 1))
+
+    subpackages = [base.joinpath(*prefix) for prefix in sorted(prefixes)]
 
     pkg_data: Dict[str, List[str]] = defaultdict(list)
 
     # Create __init__.py and py.typed files for each subdirectory.
     for pkg in subpackages:
         pkg.mkdir(exist_ok=True, parents=True)
-        pkg.joinpath('__init__.py').touch()
+
+        # List the directory once and only create the files that are missing.
+        existing = {entry.name for entry in os.scandir(pkg)}
+        for name in ('__init__.py', 'py.typed'):
+            if name not in existing:
+                pkg.joinpath(name).touch()
 
         package_name = '.'.join(pkg.relative_to(base).as_posix().split('/'))
-        pkg.joinpath('py.typed').touch()
         pkg_data[package_name].append('py.typed')
 
     # Add the .pyi for each source file.
@@ -91,10 +99,11 @@ def main(package: str, setup: Path, sources: List[Path]) -> int:
         path = base.joinpath(source).relative_to(pkg).with_suffix('.pyi')
         pkg_data[package_name].append(str(path))
 
+    # JSON strings, lists, and dicts of strings are valid Python literals.
     setup.write_text(
-        _SETUP_TEMPLATE.format(name=package,
-                               packages=list(pkg_data),
-                               package_data=dict(pkg_data)))
+        _SETUP_TEMPLATE.format(name=json.dumps(package),
+                               packages=json.dumps(list(pkg_data)),
+                               package_data=json.dumps(pkg_data)))
     return 0
 
 
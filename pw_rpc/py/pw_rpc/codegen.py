@@ -13,9 +13,8 @@
 # the License.
 """Common RPC codegen utilities."""
 
-from datetime import datetime
 import os
-from typing import cast, Any, Callable, Iterable
+from typing import cast, Any, Callable, Iterable, List, Sequence, Tuple
 
 from pw_protobuf.output_file import OutputFile
 from pw_protobuf.proto_tree import ProtoNode, ProtoService, ProtoServiceMethod
@@ -49,7 +48,6 @@ def package(file_descriptor_proto, proto_package: ProtoNode,
 
     output.write_line(f'// {os.path.basename(output.name())} automatically '
                       f'generated by {PLUGIN_NAME} {PLUGIN_VERSION}')
-    output.write_line(f'// on {datetime.now().isoformat()}')
     output.write_line('// clang-format off')
     output.write_line('#pragma once\n')
 
@@ -91,6 +89,9 @@ def service_class(service: ProtoService, root: ProtoNode, output: OutputFile,
                   method_descriptor: MethodGenerator) -> None:
     """Generates a C++ derived class for a nanopb RPC service."""
 
+    # ProtoService.methods() returns a new list on each call.
+    methods = tuple(service.methods())
+
     output.write_line('namespace generated {')
 
     base_class = f'{RPC_NAMESPACE}::Service'
@@ -139,33 +140,37 @@ def service_class(service: ProtoService, root: ProtoNode, output: OutputFile,
         # Generate the method table
         output.write_line('static constexpr std::array<'
                           f'{RPC_NAMESPACE}::internal::{method_union},'
-                          f' {len(service.methods())}> kMethods = {{')
+                          f' {len(methods)}> kMethods = {{')
+
+        # Collect the method IDs while generating the method table so the
+        # lookup table does not need a second pass over the methods.
+        method_ids: List[Tuple[str, int]] = []
 
         with output.indent(4):
-            for method in service.methods():
-                method_descriptor(method, pw_rpc.ids.calculate(method.name()),
-                                  output)
+            for method in methods:
+                method_id = pw_rpc.ids.calculate(method.name())
+                method_descriptor(method, method_id, output)
+                method_ids.append((method.name(), method_id))
 
         output.write_line('};\n')
 
         # Generate the method lookup table
-        _method_lookup_table(service, output)
+        _method_lookup_table(method_ids, output)
 
     output.write_line('};')
 
     output.write_line('\n}  // namespace generated\n')
 
 
-def _method_lookup_table(service: ProtoService, output: OutputFile) -> None:
+def _method_lookup_table(method_ids: Sequence[Tuple[str, int]],
+                         output: OutputFile) -> None:
     """Generates array of method IDs for looking up methods at compile time."""
     output.write_line('static constexpr std::array<uint32_t, '
-                      f'{len(service.methods())}> kMethodIds = {{')
+                      f'{len(method_ids)}> kMethodIds = {{')
 
     with output.indent(4):
-        for method in service.methods():
-            method_id = pw_rpc.ids.calculate(method.name())
-            output.write_line(
-                f'0x{method_id:08x},  // Hash of "{method.name()}"')
+        output.write_lines(f'0x{method_id:08x},  // Hash of "{name}"'
+                           for name, method_id in method_ids)
 
     output.write_line('};\n')
 
@@ -67,6 +67,14 @@ class TestDecodeTokenized(unittest.TestCase):
         self.assertEqual(decode.decode('%p%d%d', b'\x02\x80', True),
                          '0x00000001<[%d ERROR]><[%d SKIPPED]>')
 
+    def test_cached_format_string_is_reused(self):
+        format_string = decode.cached_format_string('%s=%d')
+        self.assertIs(format_string, decode.cached_format_string('%s=%d'))
+
+        self.assertEqual(format_string.format(b'\x01a\x02').value, 'a=1')
+        self.assertEqual(format_string.format(b'\x02bc\x03').value, 'bc=-2')
+        self.assertEqual(decode.decode('%s=%d', b'\x01a\x02'), 'a=1')
+
 
 class TestIntegerDecoding(unittest.TestCase):
     """Test decoding variable-length integers."""
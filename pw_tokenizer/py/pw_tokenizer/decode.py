@@ -20,9 +20,11 @@ Missing, truncated, or otherwise corrupted arguments are handled and displayed
 in the resulting string with an error message.
 """
 
+import functools
 import re
 import struct
-from typing import Iterable, List, NamedTuple, Match, Sequence, Tuple
+from typing import Iterable, List, NamedTuple, Match, Optional, Sequence
+from typing import Tuple
 
 
 def zigzag_decode(value: int) -> int:
@@ -32,6 +34,25 @@ def zigzag_decode(value: int) -> int:
     return (value >> 1) ^ (~0)
 
 
+def _decode_varint(encoded: bytes) -> Tuple[Optional[int], int]:
+    """Decodes a varint; returns (value or None if unterminated, size)."""
+    result = 0
+    shift = 0
+
+    # The byte count is derived from the shift, so the loop only tracks the
+    # accumulated value and its bit position.
+    for byte in encoded:
+        if byte < 0x80:  # The last byte does not have the high bit set.
+            return result | byte << shift, shift // 7 + 1
+
+        result |= (byte & 0x7f) << shift
+        shift += 7
+        if shift >= 70:  # A 64-bit varint is at most 10 bytes.
+            break
+
+    return None, shift // 7
+
+
 class FormatSpec:
     """Represents a format specifier parsed from a printf-style string."""
 
@@ -41,7 +62,6 @@ class FormatSpec:
                              r'(?P<type>[csdioxXufFeEaAgGnp])|%)')
 
     # Conversions to make format strings Python compatible.
-    _UNSUPPORTED_LENGTH = frozenset(['hh', 'll', 'j', 'z', 't'])
     _REMAP_TYPE = {'a': 'f', 'A': 'F'}
 
     # Conversion specifiers by type; n is not supported.
@@ -68,43 +88,34 @@ class FormatSpec:
         self.match = re_match
         self.specifier: str = self.match.group()
 
-        self.flags: str = self.match.group('flags') or ''
-        self.length: str = self.match.group('length') or ''
+        groups = self.match.groupdict(default='')
+        self.flags: str = groups['flags']
+        self.length: str = groups['length']
 
         # If there is no type, the format spec is %%.
-        self.type: str = self.match.group('type') or '%'
+        self.type: str = groups['type'] or '%'
+
+        # Select the decoding function once rather than on every decode.
+        self._decoder = self._DECODERS.get(self.type,
+                                           FormatSpec._decode_unsupported)
 
         # %p prints as 0xFEEDBEEF; other specs may need length/type switched
         if self.type == 'p':
             self.compatible = '0x%08X'
         else:
-            self.compatible = ''.join([
-                '%', self.flags,
-                '' if self.length in self._UNSUPPORTED_LENGTH else '',
-                self._REMAP_TYPE.get(self.type, self.type)
-            ])
+            # Python's % formatting does not take length modifiers.
+            self.compatible = (
+                f'%{self.flags}{self._REMAP_TYPE.get(self.type, self.type)}')
 
     def decode(self, encoded_arg: bytes) -> 'DecodedArg':
         """Decodes the provided data according to this format specifier."""
-        if self.type == '%':  # literal %
-            return DecodedArg(self, (),
-                              b'')  # Use () as the value for % formatting.
-
-        if self.type == 's':  # string
-            return self._decode_string(encoded_arg)
-
-        if self.type == 'c':  # character
-            return self._decode_char(encoded_arg)
+        return self._decoder(self, encoded_arg)
 
-        if self.type in self._SIGNED_INT:
-            return self._decode_signed_integer(encoded_arg)
-
-        if self.type in self._UNSIGNED_INT:
-            return self._decode_unsigned_integer(encoded_arg)
-
-        if self.type in self._FLOATING_POINT:
-            return self._decode_float(encoded_arg)
+    def _decode_literal_percent(self, unused_encoded: bytes) -> 'DecodedArg':
+        # Use () as the value for % formatting.
+        return DecodedArg(self, (), b'')
 
+    def _decode_unsupported(self, unused_encoded: bytes) -> 'DecodedArg':
         # Unsupported specifier (e.g. %n)
         return DecodedArg(
             self, None, b'', DecodedArg.DECODE_ERROR,
@@ -115,22 +126,14 @@ class FormatSpec:
         if not encoded:
             return DecodedArg.missing(self)
 
-        count = 0
-        result = 0
-        shift = 0
-
-        for byte in encoded:
-            count += 1
-            result |= (byte & 0x7f) << shift
-
-            if not byte & 0x80:
-                return DecodedArg(self, zigzag_decode(result), encoded[:count])
+        value, size = _decode_varint(encoded)
+        if value is None:
+            return self._unterminated_varint(encoded[:size])
 
-            shift += 7
-            if shift >= 64:
-                break
+        return DecodedArg(self, zigzag_decode(value), encoded[:size])
 
-        return DecodedArg(self, None, encoded[:count], DecodedArg.DECODE_ERROR,
+    def _unterminated_varint(self, raw_data: bytes) -> 'DecodedArg':
+        return DecodedArg(self, None, raw_data, DecodedArg.DECODE_ERROR,
                           'Unterminated variable-length integer')
 
     def _decode_unsigned_integer(self, encoded: bytes) -> 'DecodedArg':
@@ -147,9 +150,8 @@ class FormatSpec:
         if len(encoded) < 4:
             return DecodedArg.missing(self)
 
-        return DecodedArg(self,
-                          self._PACKED_FLOAT.unpack_from(encoded)[0],
-                          encoded[:4])
+        value, = self._PACKED_FLOAT.unpack_from(encoded)
+        return DecodedArg(self, value, encoded[:4])
 
     def _decode_string(self, encoded: bytes) -> 'DecodedArg':
         """Reads a unicode string from the encoded data."""
@@ -180,16 +182,29 @@ class FormatSpec:
 
     def _decode_char(self, encoded: bytes) -> 'DecodedArg':
         """Reads an integer from the data, then converts it to a string."""
-        arg = self._decode_signed_integer(encoded)
+        if not encoded:
+            return DecodedArg.missing(self)
 
-        if arg.ok():
-            try:
-                arg.value = chr(arg.value)
-            except (OverflowError, ValueError) as err:
-                arg.error = err
-                arg.status |= DecodedArg.DECODE_ERROR
+        value, size = _decode_varint(encoded)
+        if value is None:
+            return self._unterminated_varint(encoded[:size])
 
-        return arg
+        value = zigzag_decode(value)
+        try:
+            return DecodedArg(self, chr(value), encoded[:size])
+        except (OverflowError, ValueError) as err:
+            return DecodedArg(self, value, encoded[:size],
+                              DecodedArg.DECODE_ERROR, err)
+
+    # Decoding functions by conversion specifier type.
+    _DECODERS = {
+        '%': _decode_literal_percent,
+        's': _decode_string,
+        'c': _decode_char,
+        **dict.fromkeys(_SIGNED_INT, _decode_signed_integer),
+        **dict.fromkeys(_UNSIGNED_INT, _decode_unsigned_integer),
+        **dict.fromkeys(_FLOATING_POINT, _decode_float),
+    }
 
     def size_bits(self) -> int:
         """Size of the argument in bits; 0 for strings."""
@@ -214,6 +229,9 @@ class DecodedArg:
     DECODE_ERROR = 4  # an error occurred while decoding the argument
     SKIPPED = 8  # argument was skipped due to a previous error
 
+    # DecodedArgs are created for every argument of every decoded message.
+    __slots__ = ('specifier', 'value', 'raw_data', '_status', 'error')
+
     @classmethod
     def missing(cls, specifier: FormatSpec):
         return cls(specifier, None, b'', cls.MISSING)
@@ -224,10 +242,12 @@ class DecodedArg:
                  raw_data: bytes,
                  status: int = OK,
                  error=None):
+        if not isinstance(raw_data, bytes):
+            raw_data = bytes(raw_data)
+
         self.specifier = specifier  # FormatSpec (e.g. to represent "%0.2f")
         self.value = value  # the decoded value, or None if decoding failed
-        self.raw_data = bytes(
-            raw_data)  # the exact bytes used to decode this arg
+        self.raw_data = raw_data  # the exact bytes used to decode this arg
         self._status = status
         self.error = error
 
@@ -246,15 +266,14 @@ class DecodedArg:
 
     def format(self) -> str:
         """Returns formatted version of this argument, with error handling."""
-        if self.status == self.TRUNCATED:
-            return self.specifier.compatible % (self.value + '[...]')
-
-        if self.ok():
+        if self._status == self.OK:
             try:
                 return self.specifier.compatible % self.value
             except (OverflowError, TypeError, ValueError) as err:
                 self.status |= self.DECODE_ERROR
                 self.error = err
+        elif self._status == self.TRUNCATED:
+            return self.specifier.compatible % (self.value + '[...]')
 
         if self.status & self.SKIPPED:
             message = '{} SKIPPED'.format(self.specifier)
@@ -294,32 +313,23 @@ class FormatString:
     def __init__(self, format_string: str):
         """Parses format specifiers in the format string."""
         self.format_string = format_string
-        self.specifiers = tuple(parse_format_specifiers(self.format_string))
-
-        # List of non-specifier string pieces with room for formatted arguments.
-        self._segments = self._parse_string_segments()
 
-    def _parse_string_segments(self) -> List:
-        """Splits the format string by format specifiers."""
-        if not self.specifiers:
-            return [self.format_string]
+        specifiers: List[FormatSpec] = []
 
-        spec_spans = [spec.match.span() for spec in self.specifiers]
+        # Non-specifier string pieces that surround the formatted arguments.
+        string_pieces: List[str] = []
 
-        # Start with the part of the format string up to the first specifier.
-        string_pieces = [self.format_string[:spec_spans[0][0]]]
+        # Parse specifiers and split the string around them in a single pass.
+        end = 0
+        for match in FormatSpec.FORMAT_SPEC.finditer(format_string):
+            string_pieces.append(format_string[end:match.start()])
+            specifiers.append(FormatSpec(match))
+            end = match.end()
 
-        for ((_, end1), (start2, _)) in zip(spec_spans[:-1], spec_spans[1:]):
-            string_pieces.append(self.format_string[end1:start2])
+        string_pieces.append(format_string[end:])
 
-        # Append the format string segment after the last format specifier.
-        string_pieces.append(self.format_string[spec_spans[-1][1]:])
-
-        # Make a list with spots for the replacements between the string pieces.
-        segments: List = [None] * (len(string_pieces) + len(self.specifiers))
-        segments[::2] = string_pieces
-
-        return segments
+        self.specifiers = tuple(specifiers)
+        self._string_pieces = tuple(string_pieces)
 
     def decode(self, encoded: bytes) -> Tuple[Sequence[DecodedArg], bytes]:
         """Decodes arguments according to the format string.
@@ -364,17 +374,31 @@ class FormatString:
         Returns:
           tuple with the formatted string, decoded arguments, and remaining data
         """
-        # Insert formatted arguments in place of each format specifier.
+        # Insert formatted arguments in place of each format specifier. The
+        # segments list is local so that a FormatString may be shared.
         args, remaining = self.decode(encoded_args)
 
+        segments: List[str] = [''] * (len(self._string_pieces) + len(args))
+        segments[::2] = self._string_pieces
+
         if show_errors:
-            self._segments[1::2] = (arg.format() for arg in args)
+            segments[1::2] = (arg.format() for arg in args)
         else:
-            self._segments[1::2] = (arg.format()
-                                    if arg.ok() else arg.specifier.specifier
-                                    for arg in args)
+            segments[1::2] = (arg.format()
+                              if arg.ok() else arg.specifier.specifier
+                              for arg in args)
+
+        return FormattedString(''.join(segments), args, remaining)
 
-        return FormattedString(''.join(self._segments), args, remaining)
+
+@functools.lru_cache(maxsize=4096)
+def cached_format_string(format_string: str) -> FormatString:
+    """Returns a FormatString, reusing it for repeated format strings.
+
+    FormatString.format does not modify the FormatString, so the returned
+    instance may be shared between callers.
+    """
+    return FormatString(format_string)
 
 
 def decode(format_string: str,
@@ -392,5 +416,5 @@ def decode(format_string: str,
     Returns:
       the printf-style formatted string
     """
-    return FormatString(format_string).format(encoded_arguments,
-                                              show_errors).value
+    return cached_format_string(format_string).format(encoded_arguments,
+                                                      show_errors).value
@@ -189,7 +189,8 @@ class Detokenizer:
             return self._cache[token]
         except KeyError:
             format_strings = [
-                _TokenizedFormatString(entry, decode.FormatString(str(entry)))
+                _TokenizedFormatString(entry,
+                                       decode.cached_format_string(str(entry)))
                 for entry in self.database.token_to_entries[token]
             ]
             self._cache[token] = format_strings
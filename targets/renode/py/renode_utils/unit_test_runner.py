@@ -15,27 +15,49 @@
 """The script that runs unit tests in Renode."""
 
 import argparse
+import re
 import subprocess
 import sys
 import os
+from typing import IO, Iterable, Iterator, Set
 
 _TARGET_RENODE_COMMAND = 'renode-test'
 _TESTS_STARTING_STRING = b'[==========] Running all tests.'
 _TESTS_DONE_STRING = b'[==========] Done running all tests.'
 _TEST_FAILURE_STRING = b'[  FAILED  ]'
 
+# Matches any of the test status strings in a single scan of a line.
+_TEST_STATUS_PATTERN = re.compile(b'|'.join(
+    re.escape(status) for status in (_TESTS_STARTING_STRING,
+                                     _TESTS_DONE_STRING, _TEST_FAILURE_STRING)))
 
-def handle_test_results(test_output):
-    """Parses test output to determine whether tests passed or failed."""
-    if test_output.find(_TESTS_STARTING_STRING) == -1:
+
+def handle_test_results(test_output: Iterable[bytes]) -> int:
+    """Parses test output lines to determine whether tests passed or failed."""
+    found: Set[bytes] = set()
+
+    # Each status string is printed on a single line, so scan the log line by
+    # line as it is read instead of keeping the whole log in memory.
+    for line in test_output:
+        found.update(_TEST_STATUS_PATTERN.findall(line))
+
+    if _TESTS_STARTING_STRING not in found:
         return 1
-    if test_output.rfind(_TESTS_DONE_STRING) == -1:
+    if _TESTS_DONE_STRING not in found:
         return 1
-    if test_output.rfind(_TEST_FAILURE_STRING) != -1:
+    if _TEST_FAILURE_STRING in found:
         return 1
     return 0
 
 
+def _forward_lines(stream: IO[bytes]) -> Iterator[bytes]:
+    """Writes each line from the stream to stdout as it is read."""
+    for line in stream:
+        sys.stdout.buffer.write(line)
+        sys.stdout.flush()
+        yield line
+
+
 def parse_args():
     """Parses command-line arguments."""
     parser = argparse.ArgumentParser(description=__doc__)
@@ -47,19 +69,28 @@ def parse_args():
 
 def launch_tests(binary: str, script: str, uart: str, expected: str) -> int:
     """Start a process that runs test on binary."""
-    env = os.environ.copy()
-    env['BIN'] = os.path.abspath(binary)
-    env['SCRIPT'] = os.path.abspath(script)
-    env['UART'] = uart
-    env['EXPECTED'] = expected
-
-    cmd = [
-        _TARGET_RENODE_COMMAND, '--show-log', '-r', env['PWD'], 'test.robot'
-    ]
-
-    test_process = subprocess.run(cmd, stdout=subprocess.PIPE, env=env)
-    print(test_process.stdout.decode('utf-8'))
-    return handle_test_results(test_process.stdout)
+    cwd = os.getcwd()
+    env = dict(os.environ,
+               BIN=os.path.normpath(os.path.join(cwd, binary)),
+               SCRIPT=os.path.normpath(os.path.join(cwd, script)),
+               UART=uart,
+               EXPECTED=expected)
+
+    # PWD is not always set (e.g. on Windows or in some CI containers), so use
+    # the actual working directory for the results directory.
+    cmd = [_TARGET_RENODE_COMMAND, '--show-log', '-r', cwd, 'test.robot']
+
+    # Forward the test log as it is produced rather than after Renode exits.
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, env=env) as process:
+        assert process.stdout is not None
+        result = handle_test_results(_forward_lines(process.stdout))
+
+    # renode-test fails if the done line never appears (e.g. the test timed out
+    # or crashed). It still passes when a test fails, so the scan is needed too.
+    if process.returncode != 0:
+        return 1
+
+    return result
 
 
 def main():